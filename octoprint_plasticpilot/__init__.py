@@ -2,17 +2,64 @@
 from __future__ import absolute_import
 import octoprint.plugin
 import flask
-from flask import jsonify, request
+from flask import jsonify
 from octoprint.server import app
-import subprocess
-from time import sleep
-from threading import Thread, Lock, Event
-import threading
-from inputs import get_gamepad
+from threading import Thread, Event
+import evdev
+from evdev import ecodes
 import math
 import time
 import logging
-import json
+import os
+import selectors
+from collections import deque
+from types import MappingProxyType, SimpleNamespace
+
+# Plugin settings defaults, shared read-only; callers get a copy
+_DEFAULTS = MappingProxyType(dict(
+	max_x=200.0,
+	max_y=200.0,
+	z_drawing=0.1,
+	z_travel=1.0,
+	base_speed=3000,
+	debug_mode=False,
+	# Responsiveness settings
+	movement_check_interval=25,	# 25ms
+	command_delay=20,			# 20ms
+	smoothing_factor=20,		# percentage
+	min_movement=0.025,			# 0.025mm
+	# Speed threshold settings
+	deadzone_threshold=10,		# percentage
+	walk_threshold=40,			# percentage
+	run_threshold=75,			# percentage
+	walk_speed_multiplier=40,	# percentage
+	run_speed_multiplier=80,	# percentage
+	max_speed_multiplier=100,	# percentage
+	# Extrusion settings
+	extrusion_speed=5.0,        # mm/s for extrusion
+	retraction_speed=25.0,      # mm/s for retraction
+	extrusion_amount=0.2,       # mm per trigger press
+	retraction_amount=1.0,      # mm per trigger press
+	# Feedrate settings
+	feedrate_increment=100,     # mm/min per button press
+	min_feedrate=0.5,           # mm/s minimum feedrate (30 mm/min)
+	max_feedrate=15.0,          # mm/s maximum feedrate (500 mm/min)
+))
+
+# Movement states, ordered by speed so the faster of two states is the larger int
+_STATE_IDLE, _STATE_WALKING, _STATE_RUNNING, _STATE_MAX_SPEED = range(4)
+_STATE_NAMES = ("idle", "walking", "running", "max_speed")  # For logging
+
+_PER_MINUTE = 1.0 / 60.0  # Feedrates are mm/min, loop timing is in seconds
+
+# Longest wait between control loop passes while the controller is left alone.
+# Input still wakes the loop at once; this only bounds how late it notices
+# anything else (printer disconnects, settings saves)
+_IDLE_POLL_MAX = 0.05
+
+# How many send() commands may go out back to back before command_delay
+# spacing kicks in (token bucket size)
+_SEND_BURST = 4.0
 
 class MovementCoordinator:
 	"""
@@ -24,39 +71,48 @@ class MovementCoordinator:
 		self._logger = plugin._logger
 		self._printer = plugin._printer
 		
-		# Movement state
-		self.target_x = 0.0
-		self.target_y = 0.0
+		# Movement state. The target is where the sticks have driven the head;
+		# it runs ahead of the plugin's current position until a move is sent
+		self.target_x = plugin.current_x
+		self.target_y = plugin.current_y
 		self.target_e = 0.0
-		self.current_e = 0.0
-		self.last_movement_time = time.time()
+		self._pending_e = 0.0      # Extrusion (relative, M83) waiting to ride along with the next move
+		self._pending_e_feed = 0   # Feedrate for it if it has to go out on its own
+		self._next_update = time.monotonic()  # Deadline for the next movement update
 		self.movement_queue = []
 		
 		# Configuration
 		self.chunk_size = 0.5  # mm per movement chunk
+		self._chunk_size_sq = self.chunk_size * self.chunk_size
 		self.min_chunk = 0.1   # minimum chunk size
 		self.update_interval = 0.04  # 40ms between updates
-		
-		# Locks
-		self._movement_lock = Lock()
 	
-	def update_settings(self, settings):
-		"""Update movement parameters from settings"""
-		min_movement = float(settings.get(["min_movement"]))
+	def update_settings(self, cfg):
+		"""Update movement parameters from the plugin's cached settings"""
+		min_movement = cfg.min_movement
 		# Scale chunk size based on minimum movement setting
 		self.chunk_size = min(0.5, max(0.1, min_movement * 10))
+		self._chunk_size_sq = self.chunk_size * self.chunk_size
 		self.min_chunk = min_movement
 		
 		# Update timing from settings
-		self.update_interval = float(settings.get(["movement_check_interval"])) / 1000.0
+		self.update_interval = cfg.movement_check_interval
 	
 	def should_update(self):
-		"""Check if enough time has passed for next movement update"""
-		current_time = time.time()
-		if current_time - self.last_movement_time >= self.update_interval:
-			self.last_movement_time = current_time
-			return True
-		return False
+		"""Check if the next movement update is due"""
+		now = time.monotonic()
+		if now < self._next_update:
+			return False
+		# Advance by a whole interval so late wakeups don't push the cadence back;
+		# if we fell more than an interval behind, restart from now instead of catching up
+		self._next_update += self.update_interval
+		if self._next_update <= now:
+			self._next_update = now + self.update_interval
+		return True
+
+	def time_until_update(self):
+		"""Seconds remaining until the next movement update is due"""
+		return max(0.0, self._next_update - time.monotonic())
 	
 	def process_movement(self, movement_data, current_speed, time_delta):
 		"""
@@ -67,109 +123,182 @@ class MovementCoordinator:
 			return False
 			
 		try:
-			with self._movement_lock:
-				# Calculate potential movements
-				x_movement = movement_data['x_speed'] * current_speed * time_delta / 60
-				y_movement = movement_data['y_speed'] * current_speed * time_delta / 60
-				
-				# Calculate new target positions
-				new_x = max(0, min(self._plugin.maxX, self._plugin.current_x + x_movement))
-				new_y = max(0, min(self._plugin.maxY, self._plugin.current_y + y_movement))
-				
-				# Check if movement is significant
-				x_delta = new_x - self._plugin.current_x
-				y_delta = new_y - self._plugin.current_y
-				
-				if abs(x_delta) < self.min_chunk and abs(y_delta) < self.min_chunk:
-					return False
-				
-				# Calculate movement chunks
-				chunks = self._calculate_chunks(
-					self._plugin.current_x, self._plugin.current_y,
-					new_x, new_y,
-					current_speed
-				)
-				
-				# Send movement chunks
-				for chunk in chunks:
-					self._send_chunk(chunk)
-					
-				# Update current position
-				self._plugin.current_x = new_x
-				self._plugin.current_y = new_y
-				
-				return True
-				
+			plugin = self._plugin
+			cur_x = plugin.current_x
+			cur_y = plugin.current_y
+
+			# Calculate potential movements (speed is mm/min)
+			scale = current_speed * time_delta * _PER_MINUTE
+			
+			# Advance the target, clamped to the bed
+			new_x = self.target_x + movement_data['x_speed'] * scale
+			new_x = 0 if new_x < 0 else plugin.maxX if new_x > plugin.maxX else new_x
+			new_y = self.target_y + movement_data['y_speed'] * scale
+			new_y = 0 if new_y < 0 else plugin.maxY if new_y > plugin.maxY else new_y
+			self.target_x = new_x
+			self.target_y = new_y
+			
+			# Hold small moves back; they accumulate in the target until the
+			# pending distance is significant, then go out as one G1
+			min_chunk = self.min_chunk
+			if -min_chunk < new_x - cur_x < min_chunk and -min_chunk < new_y - cur_y < min_chunk:
+				return False
+			
+			# Calculate movement chunks
+			chunks = self._calculate_chunks(cur_x, cur_y, new_x, new_y)
+			
+			# Queue all chunks at once; they go out in this tick's single commands() call.
+			# Every chunk shares the feedrate, so format it (as integer mm/min) once
+			feed = f' F{round(current_speed)}'
+			pending_e = self._pending_e
+			if not pending_e:
+				gcodes = [f'G1 X{x:.3f} Y{y:.3f}{feed}' for x, y in chunks]
+			else:
+				# Extrude along the move rather than as a separate segment. The move
+				# keeps the stick's speed, so the printer stays in step with the
+				# stick; the E follows that pace rather than the extruder feedrate
+				self._pending_e = 0.0
+				# Chunks are equal length, so each gets an equal share of the E.
+				# Rounding the running total keeps the shares summing to pending_e
+				num_chunks = len(chunks)
+				gcodes = []
+				sent_e = 0.0
+				for i, (x, y) in enumerate(chunks, 1):
+					total_e = round(pending_e * i / num_chunks, 4)
+					gcodes.append(f'G1 X{x:.3f} Y{y:.3f} E{total_e - sent_e:.4f}{feed}')
+					sent_e = total_e
+
+			plugin.queue_gcodes(gcodes)
+			
+			# Update current position
+			plugin.current_x = new_x
+			plugin.current_y = new_y
+			
+			return True
+			
 		except Exception as e:
 			self._logger.error(f"Error processing movement: {str(e)}")
 			return False
 	
-	def _calculate_chunks(self, start_x, start_y, end_x, end_y, speed):
-		"""Break movement into smaller chunks"""
-		chunks = []
-		
+	def _calculate_chunks(self, start_x, start_y, end_x, end_y):
+		"""Break movement into smaller chunks, returned as (x, y) end points"""
 		# Calculate total distance
 		dx = end_x - start_x
 		dy = end_y - start_y
-		distance = math.sqrt(dx*dx + dy*dy)
+		distance_sq = dx*dx + dy*dy
 		
-		if distance <= self.chunk_size:
+		# Compare squared, so the common single-chunk case needs no sqrt
+		if distance_sq <= self._chunk_size_sq:
 			# Movement is small enough to be one chunk
-			chunks.append({
-				'x': end_x,
-				'y': end_y,
-				'speed': speed
-			})
-		else:
-			# Break into multiple chunks
-			num_chunks = math.ceil(distance / self.chunk_size)
-			for i in range(1, num_chunks + 1):
-				fraction = i / num_chunks
-				chunks.append({
-					'x': start_x + dx * fraction,
-					'y': start_y + dy * fraction,
-					'speed': speed
-				})
-		
+			return ((end_x, end_y),)
+
+		# Break into multiple chunks
+		num_chunks = math.ceil(math.sqrt(distance_sq) / self.chunk_size)
+		step_x = dx / num_chunks
+		step_y = dy / num_chunks
+		chunks = [(start_x + step_x * i, start_y + step_y * i) for i in range(1, num_chunks)]
+		chunks.append((end_x, end_y))  # Land exactly on the target
 		return chunks
 	
-	def _send_chunk(self, chunk):
-		"""Send a movement chunk to the printer"""
-		try:
-			gcode = f'G1 X{chunk["x"]:.3f} Y{chunk["y"]:.3f} F{chunk["speed"]}'
-			self._printer.commands([gcode])
-			# Use very small delay between chunks
-			time.sleep(0.001)
-		except Exception as e:
-			self._logger.error(f"Error sending movement chunk: {str(e)}")
-	
 	def process_extrusion(self, amount, feedrate):
-		"""Handle extrusion with movement coordination"""
+		"""
+		Handle extrusion with movement coordination.
+		Extrusion is held until the next movement update and spread over the
+		G1s of the move; retractions go out immediately at their own speed.
+		"""
 		try:
-			with self._movement_lock:
-				self.current_e += amount
-				gcode = f'G1 E{self.current_e:.3f} F{feedrate}'
-				self._printer.commands([gcode])
+			if amount > 0:
+				self._pending_e += amount
+				self._pending_e_feed = feedrate
 				return True
+
+			self.flush_extrusion()  # Keep it ordered before the retraction
+			self._plugin.queue_gcode(f'G1 E{amount:.4f} F{round(feedrate)}')
+			return True
 		except Exception as e:
 			self._logger.error(f"Error processing extrusion: {str(e)}")
 			return False
 
+	def flush_extrusion(self):
+		"""Send held extrusion that no move picked up as a standalone G1 E"""
+		if self._pending_e:
+			self._plugin.queue_gcode(f'G1 E{self._pending_e:.4f} F{round(self._pending_e_feed)}')
+			self._pending_e = 0.0
+
 	def emergency_stop(self):
 		"""Emergency stop all movement"""
 		try:
-			with self._movement_lock:
-				self._printer.commands(['M410'])  # Emergency stop
-				# Reset targets to current position
-				self.target_x = self._plugin.current_x
-				self.target_y = self._plugin.current_y
+			self._printer.commands(['M410'])  # Emergency stop
+			# Reset targets to current position
+			self.target_x = self._plugin.current_x
+			self.target_y = self._plugin.current_y
 		except Exception as e:
 			self._logger.error(f"Error during emergency stop: {str(e)}")
 
 class UserController:
-	def __init__(self):
+	__slots__ = (
+		# Published controller state
+		"left_x", "left_y", "right_x", "right_y", "left_trigger", "right_trigger",
+		"buttons",
+		"current_movement_state", "last_movement_time", "has_new_movement", "_movement",
+		# Raw event state
+		"_axes", "_held", "_presses",
+		# Device and wakeup handling
+		"_device", "_selector", "_wake_r", "_wake_w",
+		# Configuration
+		"max_analog_val", "_inv_max_analog", "_trigger_lut", "_inv_trigger_max",
+		"debug_mode", "_logger",
+		"deadzone_threshold", "walk_threshold", "run_threshold", "_raw_deadzone",
+		"_inv_dz_range", "_inv_walk_range", "_inv_run_range", "_inv_max_range",
+		"_run_walk_delta", "_max_run_delta",
+		"walk_speed_multiplier", "run_speed_multiplier", "max_speed_multiplier",
+		# Movement smoothing
+		"smoothing_factor", "last_x_speed", "last_y_speed",
+	)
+
+	# evdev stick code -> attribute published by sample()
+	_ABS_HANDLERS = {
+		ecodes.ABS_X: "left_x",     # Left stick X axis only
+		ecodes.ABS_RY: "right_y",   # Right stick Y axis only
+	}
+
+	# evdev trigger code -> attribute published by sample(), normalized to 0-1
+	_TRIGGER_HANDLERS = {
+		ecodes.ABS_Z: "left_trigger",    # Left trigger
+		ecodes.ABS_RZ: "right_trigger",  # Right trigger
+	}
+
+	# Button bits in the `buttons` mask published by sample()
+	BTN_A = 1 << 0
+	BTN_B = 1 << 1
+	BTN_X = 1 << 2
+	BTN_Y = 1 << 3
+	BTN_LB = 1 << 4
+	BTN_RB = 1 << 5
+
+	# evdev key code -> button bit
+	_KEY_HANDLERS = {
+		ecodes.BTN_SOUTH: BTN_A,    # A button
+		ecodes.BTN_EAST: BTN_B,     # B button
+		ecodes.BTN_WEST: BTN_X,     # X button
+		ecodes.BTN_NORTH: BTN_Y,    # Y button
+		ecodes.BTN_TL: BTN_LB,      # Left button
+		ecodes.BTN_TR: BTN_RB,      # Right button
+	}
+
+	def __init__(self, device):
 		self.reset_state()
+		self._device = device
+
+		# Wait on the device and a wakeup pipe, so wakeup() can interrupt read()
+		self._wake_r, self._wake_w = os.pipe()
+		os.set_blocking(self._wake_r, False)
+		self._selector = selectors.DefaultSelector()
+		self._selector.register(device.fd, selectors.EVENT_READ)
+		self._selector.register(self._wake_r, selectors.EVENT_READ)
 		self.max_analog_val = math.pow(2, 15)
+		self._inv_max_analog = 1.0 / self.max_analog_val  # Exact, max is a power of two
+		self._build_trigger_table(device)
 		self.debug_mode = False
 		self._logger = logging.getLogger("octoprint.plugins.plasticpilot")
 	
@@ -182,18 +311,48 @@ class UserController:
 		self.walk_speed_multiplier = 0.2   # Slower initial speed for precision
 		self.run_speed_multiplier = 0.6    # Medium speed for controlled movement
 		self.max_speed_multiplier = 1.0    # Full speed
+
+		self._recompute_scaling()
 	
-		# Button states
+		# Trigger states
 		self.right_trigger = 0.0
 		self.left_trigger = 0.0
-		self.right_button = False
-		self.left_button = False
 		
 		# Movement smoothing
 		self.smoothing_factor = 0.2    # Increased smoothing for more fluid movement
 		self.last_x_speed = 0.0
 		self.last_y_speed = 0.0
 
+	def update_settings(self, cfg):
+		"""Update thresholds, speed multipliers and smoothing from the plugin's cached settings"""
+		self.deadzone_threshold = cfg.deadzone_threshold
+		self.walk_threshold = cfg.walk_threshold
+		self.run_threshold = cfg.run_threshold
+		self.walk_speed_multiplier = cfg.walk_speed_multiplier
+		self.run_speed_multiplier = cfg.run_speed_multiplier
+		self.max_speed_multiplier = cfg.max_speed_multiplier
+		self.smoothing_factor = cfg.smoothing_factor
+		self._recompute_scaling()
+
+	def _recompute_scaling(self):
+		"""
+		Precompute the constants calculate_movement_speed() derives from the
+		thresholds and multipliers, so a call only multiplies. A zero-width
+		range gets a zero reciprocal; its branch can't be taken with it anyway.
+		"""
+		# Deadzone in raw axis units, so centered sticks are rejected before normalizing
+		self._raw_deadzone = self.deadzone_threshold * self.max_analog_val
+
+		dz_range = 1.0 - self.deadzone_threshold
+		run_range = self.run_threshold - self.walk_threshold
+		max_range = 1.0 - self.run_threshold
+		self._inv_dz_range = 1.0 / dz_range if dz_range else 0.0
+		self._inv_walk_range = 1.0 / self.walk_threshold if self.walk_threshold else 0.0
+		self._inv_run_range = 1.0 / run_range if run_range else 0.0
+		self._inv_max_range = 1.0 / max_range if max_range else 0.0
+		self._run_walk_delta = self.run_speed_multiplier - self.walk_speed_multiplier
+		self._max_run_delta = self.max_speed_multiplier - self.run_speed_multiplier
+
 	def reset_state(self):
 		# Analog inputs with explicit zero state
 		self.left_x = 0.0
@@ -206,32 +365,49 @@ class UserController:
 		self.left_trigger = 0.0
 		
 		# Movement state tracking
-		self.current_movement_state = "idle"  # idle, walking, running, max_speed
+		self.current_movement_state = _STATE_IDLE  # One of the _STATE_* constants
 		self.last_movement_time = time.time()
 		self.has_new_movement = False
+
+		# Returned by get_movement(), refilled in place every tick
+		self._movement = {
+			'x_speed': 0.0,
+			'y_speed': 0.0,
+			'movement_state': _STATE_IDLE,
+			'x_state': _STATE_IDLE,
+			'y_state': _STATE_IDLE
+		}
 		
-		# Button states
-		self.a_pressed = False
-		self.b_pressed = False
-		self.x_pressed = False
-		self.y_pressed = False
-		self.right_button = False
-		self.left_button = False
-
-	def read(self):
+		# Button states, one bit per button (see BTN_A..BTN_RB)
+		self.buttons = 0
+
+		# Raw event state, coalesced until the next sample()
+		self._axes = dict.fromkeys(self._ABS_HANDLERS, 0)
+		self._axes.update(dict.fromkeys(self._TRIGGER_HANDLERS, 0))
+		self._held = 0     # Buttons currently held down
+		self._presses = 0  # Buttons pressed since the last sample
+
+	def read(self, timeout=0.002):
 		"""
-		Read and process all pending controller events
+		Read and process all pending controller events.
+		Blocks on the device fd for up to `timeout` seconds (or until wakeup()),
+		then drains every queued event so a burst of axis updates is handled
+		in one call.
 		Returns True if successful, False if there was an error
 		"""
 		try:
-			events = get_gamepad()
-			if not events:  # No events to process
-				return True
+			for key, _ in self._selector.select(timeout):
+				if key.fd == self._wake_r:
+					os.read(self._wake_r, 64)  # Consume the wakeup
 
-			for event in events:
-				if not self.process_event(event):
-					self._logger.error("Failed to process controller event")
-					return False
+			while True:
+				try:
+					events = list(self._device.read())
+				except BlockingIOError:  # Device queue is empty
+					break
+
+				for event in events:
+					self.process_event(event)
 
 			return True
 			
@@ -239,6 +415,22 @@ class UserController:
 			self._logger.error(f"Error reading gamepad: {str(e)}")
 			return False
 
+	def wakeup(self):
+		"""Interrupt a read() that is waiting for input"""
+		try:
+			os.write(self._wake_w, b"\0")
+		except OSError:
+			pass  # Already closed or the pipe is full; a wakeup is pending either way
+
+	def close(self):
+		"""Release the selector, the wakeup pipe and the input device"""
+		try:
+			self._selector.close()
+			os.close(self._wake_r)
+			os.close(self._wake_w)
+		finally:
+			self._device.close()
+
 	def process_movement(self, axis, current_value, last_speed):
 		"""Process movement with enhanced smoothing"""
 		normalized, multiplier, state = self.calculate_movement_speed(current_value)
@@ -252,6 +444,11 @@ class UserController:
 			smoothing = self.smoothing_factor
 			
 		smoothed_speed = (normalized * (1 - smoothing) + last_speed * smoothing)
+
+		# Let a released stick settle at exactly zero instead of decaying forever,
+		# so get_movement() can take its idle fast path
+		if normalized == 0.0 and -0.001 < smoothed_speed < 0.001:
+			smoothed_speed = 0.0
 	
 		return smoothed_speed, state
 
@@ -261,6 +458,18 @@ class UserController:
 		Left stick controls X-axis (left/right)
 		Right stick controls Y-axis (up/down)
 		"""
+		# Fast path for the common case: both sticks centered and already at rest
+		deadzone = self._raw_deadzone
+		if (self.last_x_speed == 0.0 and self.last_y_speed == 0.0
+				and -deadzone < self.left_x < deadzone and -deadzone < self.right_y < deadzone):
+			movement_data = self._movement
+			movement_data['x_speed'] = 0.0
+			movement_data['y_speed'] = 0.0
+			movement_data['movement_state'] = _STATE_IDLE
+			movement_data['x_state'] = _STATE_IDLE
+			movement_data['y_state'] = _STATE_IDLE
+			return movement_data
+
 		# Process X movement (left/right on left stick)
 		new_x_speed, x_state = self.process_movement('X', self.left_x, self.last_x_speed)
 	
@@ -273,98 +482,115 @@ class UserController:
 		self.last_y_speed = new_y_speed
 	
 		# Determine overall movement state (use the faster of the two axes)
-		states = {"idle": 0, "walking": 1, "running": 2, "max_speed": 3}
-		x_state_val = states[x_state]
-		y_state_val = states[y_state]
-		overall_state = max(x_state, y_state, key=lambda s: states[s])
+		overall_state = x_state if x_state >= y_state else y_state
 	
-		movement_data = {
-			'x_speed': new_x_speed,
-			'y_speed': new_y_speed,
-			'movement_state': overall_state,
-			'x_state': x_state,
-			'y_state': y_state
-		}
+		# Reuse one dict instead of allocating a new one every tick; callers
+		# consume it before the next call
+		movement_data = self._movement
+		movement_data['x_speed'] = new_x_speed
+		movement_data['y_speed'] = new_y_speed
+		movement_data['movement_state'] = overall_state
+		movement_data['x_state'] = x_state
+		movement_data['y_state'] = y_state
 	
 		if self.debug_mode:
-			self._logger.info(f"Movement data: {movement_data}")
+			self._logger.info("Movement data: %s", movement_data)
 	
 		return movement_data
 
 	def process_event(self, event):
 		"""
-		Process controller events.
+		Record a controller event.
+		Axis values are coalesced (latest wins) and only applied by sample(),
+		button presses are queued so a press/release between samples is not lost.
+		Errors propagate to read(), which logs them.
+		"""
+		if self.debug_mode:
+			self._logger.info("Raw event: %s - %s - %s", event.type, event.code, event.value)
+			
+		if event.type == ecodes.EV_ABS:
+			self._axes[event.code] = event.value
+		elif event.type == ecodes.EV_KEY:
+			bit = self._KEY_HANDLERS.get(event.code)
+			if bit:
+				if event.value:
+					self._held |= bit
+					self._presses |= bit
+				else:
+					self._held &= ~bit
+
+	def _build_trigger_table(self, device):
+		"""
+		Build the trigger value -> 0-1 table from the range the device reports
+		(8-bit on some pads, 10-bit on xpad). Falls back to 0-255 if unknown.
+		"""
+		trigger_max = 0
+		for code in self._TRIGGER_HANDLERS:
+			try:
+				trigger_max = max(trigger_max, device.absinfo(code).max)
+			except Exception:
+				pass  # Axis missing or not queryable
+		if trigger_max <= 0:
+			trigger_max = 255
+		self._inv_trigger_max = 1.0 / trigger_max
+		# Table for any sane range; anything larger falls back to the multiply
+		self._trigger_lut = tuple(i / trigger_max for i in range(min(trigger_max, 4095) + 1))
+
+	def sample(self):
+		"""
+		Publish the coalesced controller state for this tick.
 		Left stick is exclusively for X movement.
 		Right stick is exclusively for Y movement.
 		"""
-		try:
-			if self.debug_mode:
-				self._logger.info(f"Raw event: {event.ev_type} - {event.code} - {event.state}")
-				
-			if event.ev_type == "Absolute":
-				if event.code == "ABS_X":  # Left stick X axis only
-					self.left_x = event.state
-					self.has_new_movement = True
-				elif event.code == "ABS_RY":  # Right stick Y axis only
-					self.right_y = event.state
-					self.has_new_movement = True
-				elif event.code == "ABS_Z":  # Left trigger
-					self.left_trigger = event.state / 255.0  # Normalize to 0-1
-				elif event.code == "ABS_RZ":  # Right trigger
-					self.right_trigger = event.state / 255.0  # Normalize to 0-1
-					
-			elif event.ev_type == "Key":
-				if event.code == "BTN_SOUTH":    # A button
-					self.a_pressed = event.state == 1
-				elif event.code == "BTN_EAST":   # B button
-					self.b_pressed = event.state == 1
-				elif event.code == "BTN_WEST":   # X button
-					self.x_pressed = event.state == 1
-				elif event.code == "BTN_NORTH":  # Y button
-					self.y_pressed = event.state == 1
-				elif event.code == "BTN_TL":     # Left button
-					self.left_button = event.state == 1
-				elif event.code == "BTN_TR":     # Right button
-					self.right_button = event.state == 1
-					
-			return True
-			
-		except Exception as e:
-			self._logger.error(f"Error processing event: {str(e)}")
-			return False
+		axes = self._axes
+		if axes[ecodes.ABS_X] != self.left_x or axes[ecodes.ABS_RY] != self.right_y:
+			self.has_new_movement = True
+		for code, attr in self._ABS_HANDLERS.items():
+			setattr(self, attr, axes[code])
+		lut = self._trigger_lut
+		for code, attr in self._TRIGGER_HANDLERS.items():
+			value = axes[code]
+			if 0 <= value < len(lut):
+				setattr(self, attr, lut[value])
+			else:
+				setattr(self, attr, min(max(value * self._inv_trigger_max, 0.0), 1.0))
+
+		# A button reads as pressed if it is held now or was tapped since the last sample
+		self.buttons = self._held | self._presses
+		self._presses = 0
 	
 	def calculate_movement_speed(self, raw_value):
 		"""
 		Calculate movement speed with improved 180-degree linear control
 		"""
+		# Apply deadzone on the raw value, skipping the float math for a centered stick
+		if -self._raw_deadzone < raw_value < self._raw_deadzone:
+			return (0.0, 0.0, _STATE_IDLE)
+
 		# Normalize the raw value to -1.0 to 1.0
-		normalized = raw_value / self.max_analog_val
+		normalized = raw_value * self._inv_max_analog
 		abs_normalized = abs(normalized)
 		
-		# Apply deadzone
-		if abs_normalized < self.deadzone_threshold:
-			return (0.0, 0.0, "idle")
-		
 		# Linear scaling for more predictable movement
 		# Map the active range (deadzone to 1.0) to 0.0 to 1.0
-		scaled = (abs_normalized - self.deadzone_threshold) / (1.0 - self.deadzone_threshold)
+		scaled = (abs_normalized - self.deadzone_threshold) * self._inv_dz_range
 		scaled = min(1.0, max(0.0, scaled))  # Clamp between 0 and 1
 		
 		# Determine movement state and calculate multiplier
 		if scaled < self.walk_threshold:
 			# Walking - linear scaling in precision range
-			state = "walking"
-			multiplier = (scaled / self.walk_threshold) * self.walk_speed_multiplier
+			state = _STATE_WALKING
+			multiplier = (scaled * self._inv_walk_range) * self.walk_speed_multiplier
 		elif scaled < self.run_threshold:
 			# Running - linear scaling in medium speed range
-			state = "running"
-			progress = (scaled - self.walk_threshold) / (self.run_threshold - self.walk_threshold)
-			multiplier = self.walk_speed_multiplier + (progress * (self.run_speed_multiplier - self.walk_speed_multiplier))
+			state = _STATE_RUNNING
+			progress = (scaled - self.walk_threshold) * self._inv_run_range
+			multiplier = self.walk_speed_multiplier + (progress * self._run_walk_delta)
 		else:
 			# Maximum speed - linear scaling in high speed range
-			state = "max_speed"
-			progress = (scaled - self.run_threshold) / (1.0 - self.run_threshold)
-			multiplier = self.run_speed_multiplier + (progress * (self.max_speed_multiplier - self.run_speed_multiplier))
+			state = _STATE_MAX_SPEED
+			progress = (scaled - self.run_threshold) * self._inv_max_range
+			multiplier = self.run_speed_multiplier + (progress * self._max_run_delta)
 		
 		# Apply direction while maintaining linear response
 		final_speed = math.copysign(scaled * multiplier, normalized)
@@ -397,12 +623,21 @@ class PlasticPilot(octoprint.plugin.SettingsPlugin,
 		self.controller_thread = None  # Initialize the controller thread
 		self.active_controller = None  # Initialize the active controller
 
-		self._position_lock = Lock()  # For protecting position updates
-		self._state_lock = Lock()     # For protecting state variables
 		self._stop_event = Event()    # For clean thread shutdown
-  
-		self._extrusion_lock = Lock()  # For protecting extrusion operations
+		self._cmd_queue = deque()  # G-code waiting for the writer thread; unbounded, G-code is never dropped
+		self._cmd_ready = Event()  # Set whenever _cmd_queue gains an item
+		self._tick_cmds = []             # G-code collected during the current controller tick
+		self._writer_thread = None
+		self._writer_stopping = False  # Shutdown sentinel queued, writer still draining
+		self._debug_mode = False      # Mirrors the debug_mode setting for send()
+
 		self.current_e_feedrate = 2.0  # Default extruder feedrate in mm/s
+		self._controller_cache = None  # (event node ctimes, controllers) from the last non-empty scan
+
+		# Per-button debounce: earliest monotonic time the button may fire again
+		self._button_next_time = dict.fromkeys(
+			(UserController.BTN_A, UserController.BTN_B, UserController.BTN_Y,
+			 UserController.BTN_LB, UserController.BTN_RB), 0.0)
 
 		# Add logger
 		self._logger = logging.getLogger("octoprint.plugins.plasticpilot")
@@ -410,7 +645,7 @@ class PlasticPilot(octoprint.plugin.SettingsPlugin,
 	@octoprint.plugin.BlueprintPlugin.route("/defaults", methods=["GET"])
 	def get_defaults(self):
 		"""Return the default settings values"""
-		return flask.jsonify(self.get_settings_defaults())
+		return flask.jsonify(dict(_DEFAULTS))
 
 
 	@octoprint.plugin.BlueprintPlugin.route("/controllers", methods=["GET"])
@@ -498,11 +733,16 @@ class PlasticPilot(octoprint.plugin.SettingsPlugin,
 
 		self._stop_event.clear()  # Reset the stop event
 		try:
-			self.joy = UserController()
+			device = self._open_controller(self.active_controller)
+			self.joy = UserController(device)
 			# Add explicit debug logging for debug mode status
 			debug_mode = self._settings.get_boolean(["debug_mode"])
 			self._logger.info(f"Starting controller with debug_mode: {debug_mode}")
 			self.joy.debug_mode = debug_mode
+			self._debug_mode = debug_mode
+
+			# Printer commands go out from their own thread from here on
+			self._start_command_writer()
 
 			# Home all axes before starting
 			self._logger.info("Homing all axes...")
@@ -527,8 +767,96 @@ class PlasticPilot(octoprint.plugin.SettingsPlugin,
 			self._logger.info(f"Controller thread started (Debug Mode: {debug_mode})")
 		except Exception as e:
 			self._logger.error(f"Failed to start controller thread: {str(e)}")
+			self._stop_command_writer()
 			raise
 
+	def _start_command_writer(self):
+		"""Start the thread that forwards queued G-code to the printer"""
+		writer = self._writer_thread
+		if writer is not None:
+			if writer.is_alive() and not self._writer_stopping:
+				return  # Still running from an earlier session, keep using it
+			# A previous stop is still draining the queue. A second writer on the
+			# same queue would reorder commands, so wait for the old one to finish
+			writer.join(timeout=3.0)
+			if writer.is_alive():
+				raise RuntimeError("Previous command writer is still sending queued G-code")
+		self._writer_stopping = False
+		self._writer_thread = Thread(target=self._command_writer)
+		self._writer_thread.daemon = True
+		self._writer_thread.start()
+		self._cmd_ready.set()  # Pick up anything queued behind the old writer's sentinel
+
+	def _stop_command_writer(self):
+		"""Flush the G-code queue and stop the writer thread"""
+		if self._writer_thread is None:
+			return
+		if not self._writer_stopping:
+			self._writer_stopping = True
+			self._enqueue(None)  # Shutdown sentinel, queued behind pending commands
+		self._writer_thread.join(timeout=1.0)
+		if self._writer_thread.is_alive():
+			# Keep the reference; the writer exits on its own once it reaches the sentinel
+			self._logger.warning("Command writer is still draining queued G-code")
+			return
+		self._writer_thread = None
+		self._writer_stopping = False
+
+	def _command_writer(self):
+		"""
+		Writer thread: hands queued G-code to the printer so the controller
+		loop never blocks on it. Commands queued through send() are rate
+		limited to one per command_delay on average, with short bursts of up
+		to _SEND_BURST allowed.
+		"""
+		tokens = _SEND_BURST
+		last_refill = time.monotonic()
+		queue = self._cmd_queue
+		ready = self._cmd_ready
+		while True:
+			ready.wait()
+			ready.clear()  # Cleared before draining, so a later append always wakes us again
+			while queue:
+				item = queue.popleft()
+				if item is None:
+					return
+				gcode, paced = item
+				try:
+					delay = self._cfg.command_delay
+					if paced and delay > 0:
+						# Refill at one token per command_delay, wait only when empty
+						now = time.monotonic()
+						tokens = min(_SEND_BURST, tokens + (now - last_refill) / delay)
+						last_refill = now
+						if tokens < 1.0:
+							wait = (1.0 - tokens) * delay
+							time.sleep(wait)
+							tokens = 1.0
+							last_refill = now + wait
+						tokens -= 1.0
+					self._printer.commands(gcode)
+				except Exception as e:
+					self._logger.error(f"Error sending GCode command: {str(e)}")
+
+	def _enqueue(self, item):
+		"""Hand an item to the writer thread; deque append is atomic, so no lock is needed"""
+		self._cmd_queue.append(item)
+		self._cmd_ready.set()
+
+	def _open_controller(self, controller_id):
+		"""Open the evdev input device matching the given controller ID"""
+		devices = [evdev.InputDevice(path) for path in evdev.list_devices()]
+		match = None
+		for device in devices:
+			if match is None and device.name == controller_id:
+				match = device
+			else:
+				device.close()
+		if match is None:
+			raise IOError(f"Controller {controller_id} not found")
+		self._logger.info(f"Opened controller {match.name} at {match.path}")
+		return match
+
 	def stop_controller_thread(self):
 		"""Stop the controller input thread with proper cleanup"""
 		if self.controller_thread is None:
@@ -537,34 +865,25 @@ class PlasticPilot(octoprint.plugin.SettingsPlugin,
 		self._logger.info("Initiating controller shutdown...")
 
 		try:
-			# Signal the thread to stop
+			# Signal the thread to stop and wake it if it is waiting for input
 			self._stop_event.set()
+			if self.joy is not None:
+				self.joy.wakeup()
 
 			# Give the thread time to finish its current iteration
-			shutdown_timeout = 3.0  # seconds
+			shutdown_timeout = 4.0  # seconds
 			self._logger.info(f"Waiting up to {shutdown_timeout} seconds for thread to stop...")
 
-			# Wait for thread to finish with timeout
-			start_time = time.time()
-			while self.controller_thread.is_alive():
-				if time.time() - start_time > shutdown_timeout:
-					self._logger.warning("Thread shutdown timed out, forcing termination")
-					break
-				time.sleep(0.1)
-
-			# If thread is still alive after timeout, try one more time
+			# Wait for thread to finish with timeout; join returns as soon as it exits
+			self.controller_thread.join(timeout=shutdown_timeout)
 			if self.controller_thread.is_alive():
-				self._logger.warning("Thread still alive after timeout, attempting final cleanup")
-				try:
-					self.controller_thread.join(timeout=1.0)
-				except Exception as e:
-					self._logger.error(f"Error during final thread cleanup: {str(e)}")
+				self._logger.warning("Controller thread did not stop in time; releasing its resources anyway")
 
 			# Clean up resources
 			if hasattr(self, 'joy') and self.joy is not None:
 				self._logger.info("Cleaning up controller resources...")
 				try:
-					del self.joy
+					self.joy.close()
 				except Exception as e:
 					self._logger.error(f"Error cleaning up controller object: {str(e)}")
 			self.joy = None
@@ -572,6 +891,9 @@ class PlasticPilot(octoprint.plugin.SettingsPlugin,
 			# Reset the thread
 			self.controller_thread = None
 
+			# Let the writer drain whatever the controller thread queued last
+			self._stop_command_writer()
+
 			# Send final status update
 			self._plugin_manager.send_plugin_message(self._identifier, {
 				"type": "controller_status",
@@ -603,75 +925,76 @@ class PlasticPilot(octoprint.plugin.SettingsPlugin,
 			return
 
 		try:
-			with self._extrusion_lock:
-				# Track cumulative extrusion amount
-				if not hasattr(self, 'current_e_position'):
-					self.current_e_position = 0.0
-
-				# Handle extrusion with right trigger
-				if self.joy.right_trigger > 0.1:  # Small deadzone
-					# Set absolute extrusion mode
-					self.send("M82")  # Switch to absolute E movements
-					
-					# Convert current_e_feedrate from mm/s to mm/min for G-code
-					e_feedrate_mmmin = self.current_e_feedrate * 60
-					amount = float(self._settings.get(["extrusion_amount"]))
-					# Scale amount by trigger pressure
-					scaled_amount = amount * self.joy.right_trigger
-					# Add to current position
-					self.current_e_position += scaled_amount
-					
-					gcode = f"G1 E{self.current_e_position:.3f} F{e_feedrate_mmmin:.1f}"
-					self.send(gcode)
-					if self.joy.debug_mode:
-						self._logger.info(f"Extruding: {scaled_amount:.3f}mm at {self.current_e_feedrate:.1f}mm/s (Total: {self.current_e_position:.3f}mm)")
-
-				# Handle retraction with left trigger
-				elif self.joy.left_trigger > 0.1:  # Small deadzone
-					# Set absolute extrusion mode
-					self.send("M82")  # Switch to absolute E movements
-					
-					retraction_speed = float(self._settings.get(["retraction_speed"]))
-					# Convert retraction speed from mm/s to mm/min for G-code
-					retraction_feedrate = retraction_speed * 60
-					amount = float(self._settings.get(["retraction_amount"]))
-					# Scale amount by trigger pressure
-					scaled_amount = amount * self.joy.left_trigger
-					# Subtract from current position
-					self.current_e_position -= scaled_amount
-					
-					gcode = f"G1 E{self.current_e_position:.3f} F{retraction_feedrate:.1f}"
-					self.send(gcode)
-					if self.joy.debug_mode:
-						self._logger.info(f"Retracting: {scaled_amount:.3f}mm at {retraction_speed:.1f}mm/s (Total: {self.current_e_position:.3f}mm)")
+			# Handle extrusion with right trigger
+			if self.joy.right_trigger > 0.1:  # Small deadzone
+				# Convert current_e_feedrate from mm/s to mm/min for G-code
+				e_feedrate_mmmin = self.current_e_feedrate * 60
+				amount = self._cfg.extrusion_amount
+				# Scale amount by trigger pressure
+				scaled_amount = amount * self.joy.right_trigger
+				
+				gcode = f"G1 E{scaled_amount:.4f} F{e_feedrate_mmmin:.1f}"
+				self.send(gcode)
+				if self.joy.debug_mode:
+					self._logger.info("Extruding: %.3fmm at %.1fmm/s", scaled_amount, self.current_e_feedrate)
+
+			# Handle retraction with left trigger
+			elif self.joy.left_trigger > 0.1:  # Small deadzone
+				retraction_speed = self._cfg.retraction_speed
+				# Convert retraction speed from mm/s to mm/min for G-code
+				retraction_feedrate = retraction_speed * 60
+				amount = self._cfg.retraction_amount
+				# Scale amount by trigger pressure
+				scaled_amount = amount * self.joy.left_trigger
+				
+				gcode = f"G1 E{-scaled_amount:.4f} F{retraction_feedrate:.1f}"
+				self.send(gcode)
+				if self.joy.debug_mode:
+					self._logger.info("Retracting: %.3fmm at %.1fmm/s", scaled_amount, retraction_speed)
 
 		except Exception as e:
 			self._logger.error(f"Error during extrusion handling: {str(e)}")
 
 
+	def _button_ready(self, bit, debounce=0.1):
+		"""
+		True if the button is pressed and its debounce window has passed.
+		Debounces by timestamp, so the controller loop never sleeps on a button.
+		"""
+		if not self.joy.buttons & bit:
+			return False
+		now = time.monotonic()
+		if now < self._button_next_time[bit]:
+			return False
+		self._button_next_time[bit] = now + debounce
+		return True
+
 	def handle_feedrate(self):
-		"""Handle extruder feedrate adjustments based on button states"""
+		"""
+		Handle extruder feedrate adjustments based on button states.
+		The feedrate applies to extrusion sent on its own; extrusion riding on
+		a move is paced by the move.
+		"""
 		if not self.joy:
 			return
 
 		try:
-			increment = float(self._settings.get(["feedrate_increment"]))
-			min_feedrate = float(self._settings.get(["min_feedrate"]))
-			max_feedrate = float(self._settings.get(["max_feedrate"]))
+			cfg = self._cfg
+			increment = cfg.feedrate_increment
+			min_feedrate = cfg.min_feedrate
+			max_feedrate = cfg.max_feedrate
 
-			if self.joy.right_button:
+			if self._button_ready(UserController.BTN_RB):
 				# Increase feedrate
 				self.current_e_feedrate = min(self.current_e_feedrate + increment, max_feedrate)
 				if self.joy.debug_mode:
-					self._logger.info(f"Increased extruder feedrate to: {self.current_e_feedrate:.1f} mm/s")
-				time.sleep(0.1)  # Debounce
+					self._logger.info("Increased extruder feedrate to: %.1f mm/s", self.current_e_feedrate)
 
-			elif self.joy.left_button:
+			elif self._button_ready(UserController.BTN_LB):
 				# Decrease feedrate
 				self.current_e_feedrate = max(self.current_e_feedrate - increment, min_feedrate)
 				if self.joy.debug_mode:
-					self._logger.info(f"Decreased extruder feedrate to: {self.current_e_feedrate:.1f} mm/s")
-				time.sleep(0.1)  # Debounce
+					self._logger.info("Decreased extruder feedrate to: %.1f mm/s", self.current_e_feedrate)
 
 		except Exception as e:
 			self._logger.error(f"Error during feedrate handling: {str(e)}")
@@ -681,49 +1004,63 @@ class PlasticPilot(octoprint.plugin.SettingsPlugin,
 		"""Enhanced thread function with coordinated movement processing"""
 		self._logger.info('Initializing controller mode' + 
 						(' (DEBUG MODE)' if self.joy.debug_mode else ''))
+		self._set_realtime_scheduling()
 		
 		# Initialize control parameters
 		error_count = 0
 		max_errors = 10
-		last_movement_time = time.time()
+		idle_ticks = 0  # Consecutive passes with no stick, trigger or button input
+		last_movement_time = time.monotonic()
 		
 		# Initialize thread parameters
 		self._update_thread_parameters()
 		
+		cfg = self._cfg
+		
 		# Update UserController thresholds from settings
-		self.joy.deadzone_threshold = self._thread_parameters['deadzone_threshold']
-		self.joy.walk_threshold = self._thread_parameters['walk_threshold']
-		self.joy.run_threshold = self._thread_parameters['run_threshold']
-		self.joy.walk_speed_multiplier = self._thread_parameters['walk_speed_multiplier']
-		self.joy.run_speed_multiplier = self._thread_parameters['run_speed_multiplier']
-		self.joy.max_speed_multiplier = self._thread_parameters['max_speed_multiplier']
-		self.joy.smoothing_factor = float(self._settings.get(["smoothing_factor"])) / 100.0
+		self.joy.update_settings(cfg)
 		
 		# Initialize movement coordinator
 		movement_coordinator = MovementCoordinator(self)
-		movement_coordinator.update_settings(self._settings)
+		movement_coordinator.update_settings(cfg)
 		
 		# Speed settings for different movement states
-		base_speed = self._thread_parameters['base_speed']
-		speed_settings = {
-			'idle': 0,
-			'walking': base_speed * self._thread_parameters['walk_speed_multiplier'],
-			'running': base_speed * self._thread_parameters['run_speed_multiplier'],
-			'max_speed': base_speed * self._thread_parameters['max_speed_multiplier']
-		}
+		speed_settings = self._speed_settings(cfg)
+
+		# Bind what the loop touches on every iteration to locals
+		joy = self.joy
+		stop_requested = self._stop_event.is_set
+		feedrate_buttons = UserController.BTN_LB | UserController.BTN_RB
+
+		# Relative extrusion: every E value sent is a delta. Queued like the E moves
+		# themselves, so it goes out whenever they do, debug mode included
+		self.queue_gcode("M83")
+		self.flush_tick()
 		
-		while not self._stop_event.is_set():
+		while not stop_requested():
 			try:
+				# Settings were saved: _update_thread_parameters() swapped in a new snapshot
+				if self._cfg is not cfg:
+					cfg = self._cfg
+					movement_coordinator.update_settings(cfg)
+					speed_settings = self._speed_settings(cfg)
+
 				if not self.bConnected or not self.joy:
 					error_count += 1
 					if error_count >= max_errors:
 						self._logger.error("Connection lost or controller disconnected")
 						break
-					time.sleep(0.1)
+					self._stop_event.wait(0.1)
 					continue
 				
-				# Read controller state
-				if not self.joy.read():
+				# Wait for input until the next movement update is due, so the
+				# device is drained right before the movement is computed. Updates
+				# while idle send nothing, so back off the longer nothing happens
+				timeout = movement_coordinator.time_until_update()
+				if idle_ticks:
+					backoff = movement_coordinator.update_interval * (1 << min(idle_ticks, 3))
+					timeout = max(timeout, min(backoff, _IDLE_POLL_MAX))
+				if not joy.read(timeout):
 					error_count += 1
 					if error_count >= max_errors:
 						self._logger.error("Failed to read controller state")
@@ -731,71 +1068,85 @@ class PlasticPilot(octoprint.plugin.SettingsPlugin,
 					continue
 				
 				error_count = 0  # Reset error count on successful read
-				current_time = time.time()
-				
-				# Get and process movement data
-				movement_data = self.joy.get_movement()
-				current_speed = speed_settings[movement_data['movement_state']]
-				
-				# Process movement if coordinator indicates it's time
+				joy.sample()
+
+				# Movement, smoothing and trigger extrusion advance once per motion
+				# tick. Wakes in between only drain input and handle buttons, so how
+				# chatty the pad is doesn't change how far or how much we move
 				if movement_coordinator.should_update():
-					time_delta = current_time - last_movement_time
+					current_time = time.monotonic()
+					interval = movement_coordinator.update_interval
+					# Capped at one interval, so the first update after an idle back-off
+					# doesn't turn the whole wait into a single long step
+					time_delta = min(current_time - last_movement_time, interval)
+					last_movement_time = current_time
+
+					# Get and process movement data
+					movement_data = joy.get_movement()
+					current_speed = speed_settings[movement_data['movement_state']]
+					if (current_speed or joy.buttons
+							or joy.right_trigger > 0.1 or joy.left_trigger > 0.1):
+						idle_ticks = 0
+					else:
+						idle_ticks += 1
+
+					# Trigger amounts are per full interval; scale by the time actually
+					# elapsed so extrusion is a rate, not a per-tick step
+					tick_fraction = time_delta / interval if interval > 0 else 1.0
+
+					# Handle extrusion with right trigger. Checked before movement, so the
+					# extrusion can be sent on this tick's move
+					if joy.right_trigger > 0.1:
+						e_feedrate_mmmin = self.current_e_feedrate * 60
+						amount = cfg.extrusion_amount * joy.right_trigger * tick_fraction
+						movement_coordinator.process_extrusion(amount, e_feedrate_mmmin)
+						if joy.debug_mode:
+							self._logger.info("Extruding: %.3fmm at %.1fmm/s", amount, self.current_e_feedrate)
+
+					# Handle retraction with left trigger
+					elif joy.left_trigger > 0.1:
+						amount = cfg.retraction_amount * joy.left_trigger * tick_fraction
+						movement_coordinator.process_extrusion(-amount, cfg.retraction_feedrate)
+						if joy.debug_mode:
+							self._logger.info("Retracting: %.3fmm at %.1fmm/s", amount, cfg.retraction_speed)
+
 					if movement_coordinator.process_movement(movement_data, current_speed, time_delta):
-						if self.joy.debug_mode:
+						if joy.debug_mode:
 							self._logger.info(
 								f"Moving to X:{self.current_x:.2f} Y:{self.current_y:.2f} "
-								f"(State: {movement_data['movement_state']}, "
+								f"(State: {_STATE_NAMES[movement_data['movement_state']]}, "
 								f"Speed: {current_speed:.1f} mm/min)"
 							)
-					last_movement_time = current_time
+					# Extrusion no move picked up this tick goes out on its own
+					movement_coordinator.flush_extrusion()
 
-				# Handle extrusion with right trigger
-				if self.joy.right_trigger > 0.1:
-					e_feedrate_mmmin = self.current_e_feedrate * 60
-					amount = float(self._settings.get(["extrusion_amount"])) * self.joy.right_trigger
-					movement_coordinator.process_extrusion(amount, e_feedrate_mmmin)
-					if self.joy.debug_mode:
-						self._logger.info(f"Extruding: {amount:.3f}mm at {self.current_e_feedrate:.1f}mm/s")
-
-				# Handle retraction with left trigger
-				elif self.joy.left_trigger > 0.1:
-					retraction_speed = float(self._settings.get(["retraction_speed"]))
-					retraction_feedrate = retraction_speed * 60
-					amount = float(self._settings.get(["retraction_amount"])) * self.joy.left_trigger
-					movement_coordinator.process_extrusion(-amount, retraction_feedrate)
-					if self.joy.debug_mode:
-						self._logger.info(f"Retracting: {amount:.3f}mm at {retraction_speed:.1f}mm/s")
-
-				# Handle feedrate adjustments
-				self.handle_feedrate()
+				# Handle feedrate adjustments, only worth the call while LB/RB is down
+				if joy.buttons & feedrate_buttons:
+					self.handle_feedrate()
 				
 				# Process button actions
-				if self.joy.a_pressed:
+				if self._button_ready(UserController.BTN_A):
 					self.drawing = not self.drawing
-					z_height = self.z_drawing if self.drawing else self.z_travel
-					gcode = f'G1 Z{z_height} F1000'
-					self._logger.info(f"Toggling drawing mode: {'Drawing' if self.drawing else 'Travel'}")
-					self.send(gcode)
-					time.sleep(0.1)  # Debounce
+					self._logger.info("Toggling drawing mode: %s", 'Drawing' if self.drawing else 'Travel')
+					self.send(cfg.z_gcode[self.drawing])
 				
-				if self.joy.b_pressed:
+				if self._button_ready(UserController.BTN_B):
 					self._logger.info("Homing XY axes")
 					self.send("G28 X Y")
 					self.current_x = 0.0
 					self.current_y = 0.0
 					movement_coordinator.target_x = 0.0
 					movement_coordinator.target_y = 0.0
-					time.sleep(0.1)  # Debounce
 				
-				# if self.joy.y_pressed:
+				# if self._button_ready(UserController.BTN_Y):
 				# 	self._logger.info("Initiating shake clear")
 				# 	self.shake_clear()
 				# 	movement_coordinator.target_x = 0.0
 				# 	movement_coordinator.target_y = 0.0
-				# 	time.sleep(0.1)  # Debounce
 				
-				# Small sleep to prevent CPU thrashing
-				threading.Event().wait(0.005)
+				# Send this tick's movement and extrusion as one batch. No sleep
+				# needed: read() blocks until input arrives or the next update is due
+				self.flush_tick()
 				
 			except Exception as e:
 				self._logger.error(f"Error in control thread: {str(e)}")
@@ -804,45 +1155,111 @@ class PlasticPilot(octoprint.plugin.SettingsPlugin,
 					self._logger.error("Too many errors, stopping controller thread")
 					break
 		
+		movement_coordinator.flush_extrusion()
+		# However the loop ended, put the extruder back in absolute mode (the
+		# firmware default) for print jobs
+		self.queue_gcode("M82")
+		self.flush_tick()
 		self._logger.info('Controller thread terminated')
 
+	def _speed_settings(self, cfg):
+		"""Feedrate in mm/min for each movement state, indexed by the _STATE_* constants"""
+		base_speed = cfg.base_speed
+		return (
+			0,
+			base_speed * cfg.walk_speed_multiplier,
+			base_speed * cfg.run_speed_multiplier,
+			base_speed * cfg.max_speed_multiplier
+		)
+
+	def _set_realtime_scheduling(self):
+		"""
+		Best effort: pin the calling (controller) thread to the last CPU and
+		give it SCHED_FIFO priority to cut scheduler wakeup jitter. Pinning
+		works for any user; SCHED_FIFO needs root or CAP_SYS_NICE, so on a
+		stock OctoPi install it is skipped and the thread keeps normal priority.
+		"""
+		cpu_count = os.cpu_count() or 1
+		if cpu_count > 1 and hasattr(os, "sched_setaffinity"):
+			try:
+				os.sched_setaffinity(0, {cpu_count - 1})
+			except OSError as e:
+				self._logger.info(f"Could not pin controller thread to CPU {cpu_count - 1}: {str(e)}")
+
+		if hasattr(os, "sched_setscheduler"):
+			try:
+				os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(10))
+			except OSError as e:
+				self._logger.info(f"Controller thread running without realtime priority: {str(e)}")
+
 	def _update_thread_parameters(self):
-		"""Update running thread parameters based on current settings"""
-		if not hasattr(self, '_thread_parameters'):
-			self._thread_parameters = {}
-			
-		self._thread_parameters.update({
-			'movement_check_interval': float(self._settings.get(["movement_check_interval"])) / 1000.0,
-			'command_delay': float(self._settings.get(["command_delay"])) / 1000.0,
-			'min_movement': float(self._settings.get(["min_movement"])),
-			'base_speed': float(self._settings.get(["base_speed"])),
-			'deadzone_threshold': float(self._settings.get(["deadzone_threshold"])) / 100.0,
-			'walk_threshold': float(self._settings.get(["walk_threshold"])) / 100.0,
-			'run_threshold': float(self._settings.get(["run_threshold"])) / 100.0,
-			'walk_speed_multiplier': float(self._settings.get(["walk_speed_multiplier"])) / 100.0,
-			'run_speed_multiplier': float(self._settings.get(["run_speed_multiplier"])) / 100.0,
-			'max_speed_multiplier': float(self._settings.get(["max_speed_multiplier"])) / 100.0
-		})
+		"""
+		Cache the movement settings as pre-converted floats (percentages as
+		fractions, milliseconds as seconds, the feedrate step as mm/s) so the
+		controller loop never has to go through the settings tree. Rebuilt on
+		every settings save.
+		"""
+		s = self._settings.get_all_data()  # One merged read instead of a lookup per key
+		z_drawing = float(s["z_drawing"])
+		z_travel = float(s["z_travel"])
+		retraction_speed = float(s["retraction_speed"])
+		self._cfg = SimpleNamespace(
+			movement_check_interval=float(s["movement_check_interval"]) / 1000.0,
+			command_delay=float(s["command_delay"]) / 1000.0,
+			min_movement=float(s["min_movement"]),
+			base_speed=float(s["base_speed"]),
+			smoothing_factor=float(s["smoothing_factor"]) / 100.0,
+			deadzone_threshold=float(s["deadzone_threshold"]) / 100.0,
+			walk_threshold=float(s["walk_threshold"]) / 100.0,
+			run_threshold=float(s["run_threshold"]) / 100.0,
+			walk_speed_multiplier=float(s["walk_speed_multiplier"]) / 100.0,
+			run_speed_multiplier=float(s["run_speed_multiplier"]) / 100.0,
+			max_speed_multiplier=float(s["max_speed_multiplier"]) / 100.0,
+			feedrate_increment=float(s["feedrate_increment"]) / 60.0,  # mm/min -> mm/s
+			min_feedrate=float(s["min_feedrate"]),
+			max_feedrate=float(s["max_feedrate"]),
+			extrusion_amount=float(s["extrusion_amount"]),
+			retraction_amount=float(s["retraction_amount"]),
+			retraction_speed=retraction_speed,
+			retraction_feedrate=retraction_speed * 60,  # mm/min, as G1 F expects
+			z_drawing=z_drawing,
+			z_travel=z_travel,
+			# Drawing-mode toggle commands, indexed by the new drawing state
+			z_gcode=(f'G1 Z{z_travel} F1000', f'G1 Z{z_drawing} F1000')
+		)
 
 	def list_available_controllers(self):
 		"""Actively scan and list all available controllers"""
 		controllers = []
 		try:
-			# Force reload by reimporting
-			import importlib
-			import inputs
-			importlib.reload(inputs)
-
-			# Get fresh list of controllers
-			available_gamepads = inputs.devices.gamepads
-
-			for device in available_gamepads:
-				controller_info = {
-					"id": device.name,
-					"name": device.name
-				}
-				controllers.append(controller_info)
-				self._logger.info(f"Found controller: {device.name}")
+			# The last scan stays valid while the set of event nodes and their
+			# ctimes is unchanged. ctime also moves when udev fixes a new node's
+			# group/mode, which list_devices() needs before it can see the pad
+			try:
+				stamp = tuple(sorted(
+					(entry.name, entry.stat().st_ctime_ns)
+					for entry in os.scandir("/dev/input") if entry.name.startswith("event")
+				))
+			except OSError:
+				stamp = None
+			if stamp is not None and self._controller_cache is not None and self._controller_cache[0] == stamp:
+				return [dict(ctrl) for ctrl in self._controller_cache[1]]
+
+			# Enumerate /dev/input directly; gamepads are the devices reporting BTN_GAMEPAD
+			for path in evdev.list_devices():
+				device = evdev.InputDevice(path)
+				try:
+					keys = device.capabilities().get(ecodes.EV_KEY, [])
+					if ecodes.BTN_GAMEPAD not in keys:
+						continue
+					controller_info = {
+						"id": device.name,
+						"name": device.name
+					}
+					controllers.append(controller_info)
+					self._logger.info(f"Found controller: {device.name}")
+				finally:
+					device.close()
 
 			if not controllers:
 				self._logger.info("No controllers found during refresh")
@@ -851,6 +1268,11 @@ class PlasticPilot(octoprint.plugin.SettingsPlugin,
 				for ctrl in controllers:
 					self._logger.info(f"  - {ctrl['name']}")
 
+			# An empty scan may just be a pad that isn't readable yet; always rescan then
+			if stamp is not None and controllers:
+				self._controller_cache = (stamp, [dict(ctrl) for ctrl in controllers])
+			else:
+				self._controller_cache = None
 			return controllers
 
 		except Exception as e:
@@ -861,87 +1283,56 @@ class PlasticPilot(octoprint.plugin.SettingsPlugin,
 	# def shake_clear(self):
 	# 	# Lift the pen
 	# 	self.drawing = False
-	# 	self.send(f'G1 Z{self.z_travel} F1000')
+	# 	gcode = [f'G1 Z{self.z_travel} F1000']
 
 	# 	# Perform rapid zigzag motion
 	# 	for i in range(4):
-	# 		self.send(f'G1 X{5} Y{5} F3000')
-	# 		self.send(f'G1 X{self.maxX-5} Y{self.maxY-5} F3000')
-	# 		self.send(f'G1 X{self.maxX-5} Y{5} F3000')
-	# 		self.send(f'G1 X{5} Y{self.maxY-5} F3000')
+	# 		gcode.extend((
+	# 			f'G1 X{5} Y{5} F3000',
+	# 			f'G1 X{self.maxX-5} Y{self.maxY-5} F3000',
+	# 			f'G1 X{self.maxX-5} Y{5} F3000',
+	# 			f'G1 X{5} Y{self.maxY-5} F3000',
+	# 		))
 
 	# 	# Return to starting position
+	# 	gcode.append('G28 X Y')
 	# 	self.current_x = 0
 	# 	self.current_y = 0
-	# 	self.send('G28 X Y')
+	# 	self.send(gcode)  # One paced commands() call for the whole pattern
 
 	def on_after_startup(self):
 		self._logger.info("Controller starting up")
 		self._logger.info(f"Available routes: {app.url_map}")
+		self._update_thread_parameters()
 		self.update_printer_dimensions()
 
 	def get_settings_defaults(self):
-		return dict(
-			max_x=200.0,
-			max_y=200.0,
-			z_drawing=0.1,
-			z_travel=1.0,
-			base_speed=3000,
-			debug_mode=False,
-			# Responsiveness settings
-			movement_check_interval=25,	# 25ms
-			command_delay=20,			# 20ms
-			smoothing_factor=20,		# percentage
-			min_movement=0.025,			# 0.025mm
-			# Speed threshold settings
-			deadzone_threshold=10,		# percentage
-			walk_threshold=40,			# percentage
-			run_threshold=75,			# percentage
-			walk_speed_multiplier=40,	# percentage
-			run_speed_multiplier=80,	# percentage
-			max_speed_multiplier=100,	# percentage
-			# Extrusion settings
-			extrusion_speed=5.0,        # mm/s for extrusion
-			retraction_speed=25.0,      # mm/s for retraction
-			extrusion_amount=0.2,       # mm per trigger press
-			retraction_amount=1.0,      # mm per trigger press
-			# Feedrate settings
-			feedrate_increment=100,     # mm/min per button press
-			min_feedrate=0.5,           # mm/s minimum feedrate (30 mm/min)
-			max_feedrate=15.0,          # mm/s maximum feedrate (500 mm/min)
-		)
+		return dict(_DEFAULTS)
 
 	def on_settings_save(self, data):
 		# Call parent implementation first to save all settings
 		octoprint.plugin.SettingsPlugin.on_settings_save(self, data)
 		
 		try:
+			# Refresh the cached settings used by the controller loop
+			self._update_thread_parameters()
+
+			self._debug_mode = self._settings.get_boolean(["debug_mode"])
+
 			# If we have an active controller, update its settings
 			if self.joy is not None:
-				# Update thresholds
-				self.joy.deadzone_threshold = float(self._settings.get(["deadzone_threshold"])) / 100.0
-				self.joy.walk_threshold = float(self._settings.get(["walk_threshold"])) / 100.0
-				self.joy.run_threshold = float(self._settings.get(["run_threshold"])) / 100.0
-				
-				# Update speed multipliers
-				self.joy.walk_speed_multiplier = float(self._settings.get(["walk_speed_multiplier"])) / 100.0
-				self.joy.run_speed_multiplier = float(self._settings.get(["run_speed_multiplier"])) / 100.0
-				self.joy.max_speed_multiplier = float(self._settings.get(["max_speed_multiplier"])) / 100.0
-				
-				# Update smoothing
-				self.joy.smoothing_factor = float(self._settings.get(["smoothing_factor"])) / 100.0
+				# Update thresholds, speed multipliers and smoothing
+				self.joy.update_settings(self._cfg)
 				
 				# Update debug mode
-				self.joy.debug_mode = self._settings.get_boolean(["debug_mode"])
+				self.joy.debug_mode = self._debug_mode
 				
 			# Update base movement settings
-			self.movement_speed = float(self._settings.get(["base_speed"]))
-			self.z_drawing = float(self._settings.get(["z_drawing"]))
-			self.z_travel = float(self._settings.get(["z_travel"]))
+			self.movement_speed = self._cfg.base_speed
+			self.z_drawing = self._cfg.z_drawing
+			self.z_travel = self._cfg.z_travel
 			
-			# Update thread parameters if the thread is running
 			if self.controller_thread is not None and self.controller_thread.is_alive():
-				self._update_thread_parameters()
 				self._logger.info("Updated controller settings successfully")
 				
 		except Exception as e:
@@ -982,16 +1373,27 @@ class PlasticPilot(octoprint.plugin.SettingsPlugin,
 
 	def send(self, gcode):
 		"""Enhanced send method with better error handling"""
-		if gcode is not None and not (hasattr(self, 'joy') and self.joy.debug_mode):
-			try:
-				if isinstance(gcode, str):
-					gcode = [gcode]	# Convert single command to list
-				self._logger.info(f"Sending GCode command(s): {gcode}")
-				self._printer.commands(gcode)
-				time.sleep(0.05)	# Small delay after sending commands
-			except Exception as e:
-				self._logger.error(f"Error sending GCode command: {str(e)}")
-				raise
+		if gcode is not None and not self._debug_mode:
+			if isinstance(gcode, str):
+				gcode = [gcode]	# Convert single command to list
+			self._logger.info("Sending GCode command(s): %s", gcode)
+			self.flush_tick()  # Keep ordering with movement queued earlier this tick
+			self._enqueue((gcode, True))
+
+	def queue_gcode(self, gcode):
+		"""Collect a G-code line for the current tick; flush_tick() sends the batch"""
+		self._tick_cmds.append(gcode)
+
+	def queue_gcodes(self, gcodes):
+		"""Collect several G-code lines for the current tick"""
+		self._tick_cmds.extend(gcodes)
+
+	def flush_tick(self):
+		"""Hand everything collected this tick to the writer as a single commands() call"""
+		if self._tick_cmds:
+			# The writer owns the list from here on, so start a new one instead of clearing
+			self._enqueue((self._tick_cmds, False))
+			self._tick_cmds = []
 
 	def on_shutdown(self):
 		self._logger.info('Shutdown received...')